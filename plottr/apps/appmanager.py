@@ -13,13 +13,33 @@ app processes. An app can be launched using the launchApp function.
     will result in the app not opening without an error warning.
 """
 
+import io
+import os
+import heapq
+import logging
 import sys
+import json
+import pickle
+import shutil
+import tempfile
+import numpy as np
 import zmq
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import partial
+from itertools import count
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
-from typing import Dict, Union, Any, Callable, Tuple, Optional
+from typing import Dict, List, Sequence, Union, Any, Callable, Tuple, Optional, cast
 
 from traceback import print_exception
-from plottr import QtCore, QtWidgets, QtGui, Flowchart, Signal, Slot, log, qtapp, qtsleep, plottrPath
+
+try:
+    import msgpack
+except ImportError:
+    # without msgpack every message gets pickled
+    msgpack = None
+
+from plottr import QtCore, QtWidgets, QtGui, Flowchart, Signal, Slot, log, qtapp, plottrPath
 from plottr.gui.widgets import PlotWindow
 
 
@@ -29,101 +49,492 @@ AppType = Callable[[Any], Tuple[Flowchart, PlotWindow]]
 #: The type of the ids.
 IdType = Union[int, str]
 
+#: The default transport used for the communication between manager and apps. Unix domain sockets (``ipc``) skip the
+#: TCP stack entirely; we fall back to ``tcp`` on the loopback interface if libzmq has not been built with ipc support
+#: (e.g. on Windows with libzmq < 4.3).
+DEFAULT_TRANSPORT = 'ipc' if zmq.has('ipc') else 'tcp'
+
+#: The high water mark (in messages) of all sockets, in both directions.
+SOCKET_HWM = 1000
+
+#: Kernel send and receive buffer size (in bytes) of the sockets that carry data between manager and apps. Larger
+#: than the usual OS default so that large DataDicts do not get throttled by the socket buffers.
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+#: Arrays sent to an app with at least this many bytes are passed through shared memory instead of the socket.
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+#: Path of the script that runs the apps.
+APPRUNNER = str(Path(plottrPath).joinpath('apps', 'apprunner.py'))
+
+#: Command line flag that starts the apprunner in standby: it imports plottr and then waits for the arguments of the
+#: app to launch on its standard input.
+STANDBY_FLAG = '--standby'
+
+#: Seconds the synchronous calls of the manager (:meth:`.AppManager.pingApp`, :meth:`.AppManager.messageSync`) wait
+#: for the reply of an app by default.
+REPLY_TIMEOUT = 10.0
+
+#: The pickle protocol used for all messages. Protocol 5 (the highest for python >= 3.8) is needed for out-of-band
+#: buffers.
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
 
 logger = log.getLogger(__name__)
 
 
+def configure_io_threads(n: int, affinity: Optional[Sequence[int]] = None) -> None:
+    """
+    Sets the number of I/O threads of the zmq context shared by the app manager and the apps of this process.
+    Only has an effect if called before any socket is created.
+
+    One I/O thread is plenty for the control messages; more threads (or more sockets) only pay off when several apps
+    receive large data at the same time, at the cost of one more busy thread each.
+
+    :param n: The number of I/O threads.
+    :param affinity: CPUs the I/O threads should be pinned to. Ignored if libzmq does not support thread affinity.
+    """
+    context: zmq.Context = zmq.Context.instance()
+    context.set(zmq.IO_THREADS, n)
+    if affinity is not None:
+        try:
+            for cpu in affinity:
+                context.set(zmq.THREAD_AFFINITY_CPU_ADD, cpu)
+        except zmq.ZMQError as e:
+            logger.warning(f'libzmq does not support pinning I/O threads to CPUs, ignoring the affinity: {e}')
+
+
+def _makeSocket(context: zmq.Context, socketType: int, bufferSize: Optional[int] = None) -> zmq.Socket:
+    """
+    Creates a socket with the options we use for all sockets: no lingering on close, so closing never blocks on
+    unresponsive peers, and a finite high water mark.
+
+    :param context: The zmq context.
+    :param socketType: The zmq socket type, e.g. ``zmq.REP``.
+    :param bufferSize: If not None, the kernel send and receive buffer size of the socket in bytes.
+    :returns: The new socket.
+    """
+    socket = context.socket(socketType)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.setsockopt(zmq.SNDHWM, SOCKET_HWM)
+    socket.setsockopt(zmq.RCVHWM, SOCKET_HWM)
+    if bufferSize is not None:
+        socket.setsockopt(zmq.SNDBUF, bufferSize)
+        socket.setsockopt(zmq.RCVBUF, bufferSize)
+    return socket
+
+
+def _socketNotifier(socket: zmq.Socket, parent: QtCore.QObject) -> QtCore.QSocketNotifier:
+    """
+    Creates a QSocketNotifier for the file descriptor of a zmq socket. The descriptor becomes readable whenever the
+    events of the socket change, use :func:`._hasMessage` to check for messages.
+    """
+    # The Qt stubs ask for a sip.voidptr, Qt takes the integer descriptor zmq returns.
+    fd: Any = socket.getsockopt(zmq.FD)
+    return QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read, parent)
+
+
+def _hasMessage(socket: zmq.Socket) -> bool:
+    """
+    Returns True if a message can be received from the socket without blocking.
+    """
+    return bool(cast(int, socket.getsockopt(zmq.EVENTS)) & zmq.POLLIN)
+
+
+def _endpoint(port: Union[int, str], transport: str = DEFAULT_TRANSPORT, directory: Optional[str] = None) -> str:
+    """
+    Returns the zmq endpoint an app with the given port listens on.
+
+    :param port: The port number of the app. For ``ipc`` the port only names the socket file. With ``tcp``, ``'*'``
+        gives a wildcard endpoint, zmq picks a free port when binding to it.
+    :param transport: Either ``ipc`` or ``tcp``.
+    :param directory: The directory of the ``ipc`` socket files. Every manager uses its own directory, so that apps of
+        different managers never share a socket file. Defaults to the temporary directory.
+    :returns: The endpoint string.
+    """
+    if transport == 'ipc':
+        if directory is None:
+            directory = tempfile.gettempdir()
+        return f'ipc://{Path(directory).joinpath(f"plottr-{port}.ipc").as_posix()}'
+    elif transport == 'tcp':
+        return f'tcp://127.0.0.1:{port}'
+    raise ValueError(f"Transport '{transport}' is not supported, use 'ipc' or 'tcp'.")
+
+
+#: First frame of a message serialized with msgpack.
+_MSGPACK_TAG = b'\x00'
+
+#: First frame of a pickled message.
+_PICKLE_TAG = b'\x01'
+
+_MSGPACK_SCALARS = (type(None), bool, int, float, str, bytes)
+
+#: Message an app sends to its manager as soon as it has connected. The manager holds back the requests for an app
+#: until it has said hello, since the ``ROUTER`` socket can only route messages to apps that are connected.
+_HELLO = b'hello'
+
+
+def _isPlain(obj: Any) -> bool:
+    """
+    Checks if an object survives a round trip through msgpack unchanged: scalars, tuples of plain objects and
+    dictionaries with string keys and plain values. Lists are excluded since they come back as tuples.
+    """
+    objType = type(obj)
+    if objType in _MSGPACK_SCALARS:
+        return True
+    if objType is tuple:
+        return all(_isPlain(o) for o in obj)
+    if objType is dict:
+        return all(type(k) is str and _isPlain(v) for k, v in obj.items())
+    return False
+
+
+def _attachSharedMemory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to an existing shared memory block without taking ownership of it: the block gets unlinked by the
+    process that created it, not by the resource tracker of this process.
+    """
+    if sys.version_info >= (3, 13):
+        # Passed as keyword dictionary, older typeshed versions don't know about the argument.
+        options: Dict[str, Any] = {'track': False}
+        return shared_memory.SharedMemory(name=name, **options)
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == 'posix':
+        # Before python 3.13 attaching registers the block with the resource tracker, which would unlink it (and
+        # complain about a leak) when this process exits.
+        resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+    return shm
+
+
+class _SharedArrayOwner:
+    """
+    Exposes a shared memory block as an array and keeps the block attached as long as any array uses it: arrays
+    created from an instance have it as their base.
+    """
+
+    def __init__(self, name: str, shape: Tuple[int, ...], dtype: str):
+        self.shm = _attachSharedMemory(name)
+        assert self.shm.buf is not None
+        address = np.frombuffer(self.shm.buf, dtype=np.uint8).__array_interface__['data'][0]
+        self.__array_interface__ = {'shape': tuple(shape), 'typestr': dtype, 'data': (address, False), 'version': 3}
+
+    def __del__(self) -> None:
+        if hasattr(self, 'shm'):
+            self.shm.close()
+
+
+class _SharedMemoryPickler(pickle.Pickler):
+    """
+    Pickler that copies large numpy arrays into new shared memory blocks and only pickles a reference to the block.
+    The blocks are appended to ``blocks``; the sender has to unlink them once the receiver is done with them.
+    """
+
+    def __init__(self, file: io.BytesIO, blocks: List[shared_memory.SharedMemory], **kwargs: Any):
+        super().__init__(file, **kwargs)
+        self.blocks = blocks
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[str, str, Tuple[int, ...], str]]:
+        if type(obj) is np.ndarray and obj.dtype.kind in 'biufcmMSU' and obj.nbytes >= SHARED_MEMORY_THRESHOLD:
+            shm = shared_memory.SharedMemory(create=True, size=obj.nbytes)
+            self.blocks.append(shm)
+            np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)[...] = obj
+            return ('shm', shm.name, obj.shape, obj.dtype.str)
+        return None
+
+
+class _SharedMemoryUnpickler(pickle.Unpickler):
+    """
+    Unpickler that maps the arrays pickled by :class:`._SharedMemoryPickler` from their shared memory blocks,
+    without copying them.
+    """
+
+    def persistent_load(self, pid: Any) -> Any:
+        if isinstance(pid, tuple) and pid[0] == 'shm':
+            _, name, shape, dtype = pid
+            return np.asarray(_SharedArrayOwner(name, shape, dtype))
+        raise pickle.UnpicklingError(f'Unsupported persistent id: {pid}')
+
+
+def _serialize(obj: Any, sharedBlocks: Optional[List[shared_memory.SharedMemory]] = None) -> List[Any]:
+    """
+    Serializes an object into the frames of a multipart message. The first frame is a tag indicating the
+    serialization.
+
+    Small control messages (e.g. ``'ping'`` or ``(targetName, targetProperty, 1.0)``) are packed with msgpack if
+    it is installed. Everything else gets pickled: the second frame holds the pickle stream, the following frames
+    hold the out-of-band buffers of the object (e.g. the data of numpy arrays), which can be handed to zmq without
+    being copied.
+
+    :param obj: Any object that can be pickled.
+    :param sharedBlocks: If not None, numpy arrays larger than :data:`.SHARED_MEMORY_THRESHOLD` are copied into
+        shared memory blocks instead, which get appended to this list. The caller has to close and unlink them once
+        the receiver is done with the message.
+    :returns: The list of frames.
+    """
+    if msgpack is not None and _isPlain(obj):
+        try:
+            return [_MSGPACK_TAG, msgpack.packb(obj, use_bin_type=True)]
+        except (TypeError, ValueError, OverflowError):
+            pass
+
+    buffers: List[pickle.PickleBuffer] = []
+    if sharedBlocks is None:
+        data = pickle.dumps(obj, protocol=PICKLE_PROTOCOL, buffer_callback=buffers.append)
+    else:
+        file = io.BytesIO()
+        _SharedMemoryPickler(file, sharedBlocks, protocol=PICKLE_PROTOCOL, buffer_callback=buffers.append).dump(obj)
+        data = file.getvalue()
+    return [_PICKLE_TAG, data] + [b.raw() for b in buffers]
+
+
+def _deserialize(frames: Sequence[Union[bytes, memoryview]]) -> Any:
+    """
+    Deserializes the frames created by :func:`._serialize`. Also understands a single frame created by
+    ``send_pyobj``. Arrays are reconstructed directly on top of the out-of-band buffers, without copying.
+
+    :param frames: The frames of the message, e.g. the buffers of the zmq frames received with ``copy=False``.
+    :returns: The deserialized object.
+    """
+    if frames[0] == _MSGPACK_TAG:
+        if msgpack is None:
+            raise RuntimeError('Received a msgpack message but msgpack is not installed.')
+        return msgpack.unpackb(frames[1], use_list=False, raw=False)
+    if frames[0] == _PICKLE_TAG:
+        frames = frames[1:]
+    # The out-of-band buffers need to be writable, arrays reconstructed from them are otherwise read-only.
+    buffers = [f if isinstance(f, memoryview) and not f.readonly else bytearray(f) for f in frames[1:]]
+    return _SharedMemoryUnpickler(io.BytesIO(frames[0]), buffers=buffers).load()
+
+
+def _send(socket: zmq.Socket, obj: Any, copy: bool = False) -> None:
+    """
+    Serializes and sends an object as a multipart message, see :func:`._serialize`.
+
+    :param socket: The socket to send through.
+    :param obj: Any object that can be pickled.
+    :param copy: If True, zmq copies the buffers before the call returns. Needed if the object can change before the
+        message has actually been sent.
+    """
+    socket.send_multipart(_serialize(obj), copy=copy)
+
+
+def _recv(socket: zmq.Socket) -> Any:
+    """
+    Receives and deserializes an object sent with :func:`._send`. The frames are received without copying them
+    into python bytes, the object is built from the zmq message buffers directly.
+
+    :param socket: The socket to receive from.
+    :returns: The received object.
+    """
+    return _deserialize([f.buffer for f in socket.recv_multipart(copy=False)])
+
+
+class LogForwarder(logging.Handler):
+    """
+    Logging handler that forwards the log records of an app to its manager through a zmq ``PUSH`` socket. Records are
+    sent as plain dictionaries (packed with msgpack if available), after a frame with the port of the app.
+
+    Records are queued until the connection to the manager is up, if the queue is full (or the manager is gone) they
+    get dropped instead of blocking the app.
+    """
+
+    #: Attributes of a log record that get sent.
+    ATTRIBUTES = ('name', 'levelno', 'levelname', 'pathname', 'filename', 'module', 'lineno', 'funcName', 'created',
+                  'msecs', 'relativeCreated', 'thread', 'threadName', 'process', 'processName')
+
+    def __init__(self, endpoint: str, port: str):
+        """
+        Constructor for :class:`.LogForwarder`.
+
+        :param endpoint: The endpoint the manager receives the log records on.
+        :param port: The port of the app, tells the manager where the records come from.
+        """
+        super().__init__()
+        self.port = port.encode()
+        self.socket: Optional[zmq.Socket] = _makeSocket(zmq.Context.instance(), zmq.PUSH)
+        self.socket.connect(endpoint)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.socket is None:
+            return
+        try:
+            info = {attribute: getattr(record, attribute, None) for attribute in self.ATTRIBUTES}
+            info['msg'] = record.getMessage()
+            if record.exc_info:
+                info['exc_text'] = logging.Formatter().formatException(record.exc_info)
+            elif record.exc_text:
+                info['exc_text'] = record.exc_text
+            self.socket.send_multipart([self.port] + _serialize(info), flags=zmq.NOBLOCK, copy=False)
+        except zmq.Again:
+            pass
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        super().close()
+
+
+def _bindLocal(socket: zmq.Socket, name: str, transport: str, directory: Optional[str] = None) -> str:
+    """
+    Binds a socket of the manager, that the apps connect to. With ``ipc`` the socket file is named after ``name``,
+    with ``tcp`` zmq picks a free port.
+
+    :param socket: The socket to bind.
+    :param name: The name of the socket file.
+    :param transport: Either ``ipc`` or ``tcp``.
+    :param directory: The directory of the socket file, see :func:`._endpoint`.
+    :returns: The endpoint the socket has been bound to.
+    """
+    socket.bind(_endpoint(name if transport == 'ipc' else '*', transport, directory))
+    return socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
+
 # TODO: Check that when the automatic rst is generated, the formatting of the docstrings are correct.
 class AppServer(QtCore.QObject):
-    """Simple helper object that we can run in a separate thread to listen
-    to commands from the manager.
+    """Simple helper object that listens to commands. It does not need its own thread: the sockets are watched by
+    QSocketNotifiers, so the Qt event loop of the app wakes the server up when a message arrives.
+
+    The server listens on two sockets. A ``REP`` socket bound to the endpoint of the app (see :func:`._endpoint`)
+    takes requests from any ``REQ`` socket. If the app has been launched by an :class:`.AppManager`, a ``DEALER``
+    socket connects to the ``ROUTER`` socket of the manager, with the port of the app as routing identity. It says
+    hello (see :data:`._HELLO`) as soon as it connects, and the requests of the manager come in over it.
 
-    When the server gets a message, the messageReceived signal gets emitted. Once that happens it will wait until the
-    reply variable gets filled with a reply (this is done by triggering the slot loadReply()). After that, sends the
-    reply back and resets the reply variable.
+    When the server gets a message, the messageReceived signal gets emitted. The reply is expected to be loaded
+    (by triggering the slot loadReply()) before the emit returns, and is sent back right away.
 
     To see the rules of what can be received please see the :obj:App.onMessageReceived. Only exception is if the server
     receives the string "ping", it will immediately reply with the string "pong" without bothering the App.
 
-    There are 2 ways of stopping the server:
-        * You can request an interruption of the thread the server is running on.
-        * Trigger the quit() slot with a signal.
-    Both ways will make the running variable ``False``, and stop the listening loop.
+    The server stops listening when the quit() slot gets triggered.
     """
 
     messageReceived = Signal(object)
 
-    def __init__(self, port: str, parent: Optional[QtCore.QObject] = None):
+    def __init__(self, port: str, parent: Optional[QtCore.QObject] = None, transport: str = DEFAULT_TRANSPORT,
+                 socketDirectory: Optional[str] = None, managerEndpoint: Optional[str] = None):
         """
         Constructor for :class: `.AppServer`
 
-        :param context: The zmq context generated by the app.
         :param port: The port number, in string format, to which to listen to commands.
         :param parent: The parent of the server.
+        :param transport: The zmq transport to listen on, either ``ipc`` or ``tcp``.
+        :param socketDirectory: The directory of the ``ipc`` socket file, see :func:`._endpoint`.
+        :param managerEndpoint: The endpoint of the manager that launched the app, if any.
         """
         super().__init__(parent=parent)
         self.port = port
-        self.address = '127.0.0.1'
-        self.context = zmq.Context()
-        self.t_blocking = 1000  # in ms
-        self.reply = None
-        self.running = True
-
-        self.socket: Optional[zmq.Socket] = self.context.socket(zmq.REP)
-        self.poller = zmq.Poller()
-        self.poller.register(self.socket, zmq.POLLIN)
-
-    def run(self) -> None:
+        self.transport = transport
+        self.socketDirectory = socketDirectory
+        self.managerEndpoint = managerEndpoint
+        self.context: zmq.Context = zmq.Context.instance()
+        # The socket and the envelope the reply to the message that is being handled goes to.
+        self.replyTo: Optional[Tuple[zmq.Socket, List[bytes]]] = None
+
+        self.socket: Optional[zmq.Socket] = _makeSocket(self.context, zmq.REP, SOCKET_BUFFER_SIZE)
+        self.notifier: Optional[QtCore.QSocketNotifier] = None
+
+        self.dealer: Optional[zmq.Socket] = None
+        self.dealerNotifier: Optional[QtCore.QSocketNotifier] = None
+        if managerEndpoint is not None:
+            self.dealer = _makeSocket(self.context, zmq.DEALER, SOCKET_BUFFER_SIZE)
+            self.dealer.setsockopt(zmq.IDENTITY, port.encode())
+
+    def start(self) -> None:
         """
-        Connects the socket and starts listening for commands.
+        Binds the socket, connects to the manager and starts listening for commands.
         """
         assert isinstance(self.socket, zmq.Socket)
-        self.socket.bind(f'tcp://{self.address}:{self.port}')
-
-        while self.running:
-            # Check if there are any messages.
-            evts = []
-            if not self.socket._closed:
-                evts = self.poller.poll(self.t_blocking)
-            if len(evts) > 0:
-                message = self.socket.recv_pyobj()
-                if message == 'ping':
-                    self.socket.send_pyobj('pong')
-                else:
-                    self.messageReceived.emit(message)
-                    # Wait until the reply is generated.
-                    while self.reply is None:
-                        qtsleep(0.01)
-                    self.socket.send_pyobj(self.reply)
-                    self.reply = None
-
-            if self.thread().isInterruptionRequested():
-                self.running = False
-            qtsleep(0.5)
-
-        # When the server is done, close the socket.
-        self.socket.close(1)
-        self.socket = None
+        self.socket.bind(_endpoint(self.port, self.transport, self.socketDirectory))
+        self.notifier = _socketNotifier(self.socket, self)
+        self.notifier.activated.connect(self.onActivated)
+        if self.dealer is not None:
+            assert self.managerEndpoint is not None
+            self.dealer.connect(self.managerEndpoint)
+            self.dealer.send(_HELLO)
+            self.dealerNotifier = _socketNotifier(self.dealer, self)
+            self.dealerNotifier.activated.connect(self.onActivated)
+        # Messages might have arrived before the notifiers existed.
+        self.onActivated()
+
+    @Slot()
+    def onActivated(self) -> None:
+        """
+        Gets called when the file descriptor of a socket becomes readable. The descriptors only signal changes, so
+        all pending messages have to be handled before waiting for the next notification.
+        """
+        for notifier in (self.notifier, self.dealerNotifier):
+            if notifier is not None:
+                notifier.setEnabled(False)
+        handled = True
+        while handled:
+            handled = self.handleNext(self.socket, 0)
+            # Requests of the manager start with the envelope [request id, empty delimiter], the reply needs it too.
+            handled = self.handleNext(self.dealer, 2) or handled
+        for notifier in (self.notifier, self.dealerNotifier):
+            if notifier is not None:
+                notifier.setEnabled(True)
+
+    def handleNext(self, socket: Optional[zmq.Socket], envelopeSize: int) -> bool:
+        """
+        Handles the next message of a socket, if there is one.
+
+        :param socket: The socket to receive from.
+        :param envelopeSize: The number of frames in front of the message that go back with the reply.
+        :returns: True if a message has been handled, False if there was none.
+        """
+        if socket is None or not _hasMessage(socket):
+            return False
+        frames = socket.recv_multipart(copy=False)
+        self.replyTo = (socket, [f.bytes for f in frames[:envelopeSize]])
+        message = _deserialize([f.buffer for f in frames[envelopeSize:]])
+        if message == 'ping':
+            self.loadReply('pong')
+        else:
+            self.messageReceived.emit(message)
+            # Never leave a request without a reply, the REP socket would not accept any further messages and the
+            # manager would wait for it.
+            if self.replyTo is not None:
+                self.loadReply(RuntimeError(f'The app did not reply to the message {message}.'))
+        return True
 
     @Slot()
     def quit(self) -> None:
         """
-        Stops the server.
+        Stops the server and closes the sockets.
         """
-        self.running = False
+        self.replyTo = None
+        for notifier in (self.notifier, self.dealerNotifier):
+            if notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+        self.notifier = None
+        self.dealerNotifier = None
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        if self.dealer is not None:
+            self.dealer.close()
+            self.dealer = None
 
     @Slot(object)
     def loadReply(self, reply: Any) -> None:
         """
         Slot used to load the reply of a command. Should be connected to a signal that emits the reply.
         """
-        self.reply = reply
+        if self.replyTo is not None:
+            socket, envelope = self.replyTo
+            self.replyTo = None
+            # The reply can hold views of arrays of the flowchart, which may change before zmq has sent it.
+            socket.send_multipart(envelope + _serialize(reply), copy=True)
 
 
 class App(QtCore.QObject):
     """
     Object that effectively wraps a plottr app.
-    Runs an :class:`.AppServer` in a separate thread, which allows to receive and send messages
+    Runs an :class:`.AppServer`, which allows to receive and send messages
     from the parent :class:`.AppManager` to the app.
     """
 
@@ -132,9 +543,17 @@ class App(QtCore.QObject):
     #:  Any python object that can be pickled.
     replyReady = Signal(object)
 
-    def __init__(self, setupFunc: AppType, port: int, parent: Optional[QtCore.QObject] = None, *args: Any):
+    def __init__(self, setupFunc: AppType, port: int, parent: Optional[QtCore.QObject] = None, *args: Any,
+                 transport: str = DEFAULT_TRANSPORT, logEndpoint: Optional[str] = None,
+                 socketDirectory: Optional[str] = None, managerEndpoint: Optional[str] = None):
         super().__init__(parent=parent)
 
+        # Forward the log of the app to the manager, if it listens for it.
+        self.logForwarder: Optional[LogForwarder] = None
+        if logEndpoint is not None:
+            self.logForwarder = LogForwarder(logEndpoint, str(port))
+            logging.getLogger().addHandler(self.logForwarder)
+
         self.fc, self.win = setupFunc(args[0])
         assert isinstance(self.fc, Flowchart)
         assert isinstance(self.win, PlotWindow)
@@ -142,14 +561,12 @@ class App(QtCore.QObject):
         self.win.windowClosed.connect(self.onQuit)
 
         self.port = port
-        self.server: Optional[AppServer] = AppServer(str(port))
-        self.serverThread: Optional[QtCore.QThread] = QtCore.QThread()
+        self.server: Optional[AppServer] = AppServer(str(port), parent=self, transport=transport,
+                                                       socketDirectory=socketDirectory, managerEndpoint=managerEndpoint)
 
         self.replyReady.connect(self.server.loadReply)
         self.server.messageReceived.connect(self.onMessageReceived)
-        self.server.moveToThread(self.serverThread)
-        self.serverThread.started.connect(self.server.run)
-        self.serverThread.start()
+        self.server.start()
 
     @Slot(object)
     def onMessageReceived(self, message: Tuple[str, str, Any]) -> None:
@@ -209,26 +626,27 @@ class App(QtCore.QObject):
     @Slot()
     def onQuit(self) -> None:
         """
-        Gets called when win is about to close. Stops the server and stops the server thread.
+        Gets called when win is about to close. Stops the server.
         """
         if self.server is not None:
             self.server.quit()
-
-        if self.server is not None and self.serverThread is not None:
-            self.serverThread.requestInterruption()
-            self.serverThread.quit()
-            self.serverThread.wait()
             self.server.deleteLater()
-            self.serverThread.deleteLater()
-            self.serverThread = None
             self.server = None
 
+        if self.logForwarder is not None:
+            logging.getLogger().removeHandler(self.logForwarder)
+            self.logForwarder.close()
+            self.logForwarder = None
+
 
 class ProcessMonitor(QtCore.QObject):
     """
-    Helper class that runs in a separate thread. Its job is to constantly check if a process is still running and
-    alert the AppManager when a process has been closed and to print any standard output or standard error that
-    any process is sending.
+    Helper class whose job is to alert the AppManager when a process has been closed. It does not poll the processes
+    and needs no thread of its own, it only reacts to the signals of each QProcess, including errorOccurred for
+    processes that fail to start.
+
+    The log records of the apps reach the manager through zmq (see :class:`.LogForwarder`), any other output of the
+    processes is forwarded to the standard output and error of the manager process directly.
     """
 
     #: Signal(IdType) -- emitted when it detects that a process is closed.
@@ -239,7 +657,6 @@ class ProcessMonitor(QtCore.QObject):
     def __init__(self, parent: Optional[QtCore.QObject] = None):
         super().__init__(parent=parent)
         self.processes: Dict[IdType, QtCore.QProcess] = {}
-        self.checking = True
 
     @Slot(object, object)
     def onNewProcess(self, Id: IdType, process: QtCore.QProcess) -> None:
@@ -250,57 +667,313 @@ class ProcessMonitor(QtCore.QObject):
         :param process: The QProcess to keep track of.
         """
         self.processes[Id] = process
-        self.processes[Id].readyReadStandardOutput.connect(self.onReadyStandardOutput)
-        self.processes[Id].readyReadStandardError.connect(self.onReadyStandardError)
+        process.finished.connect(partial(self.onProcessFinished, Id))
+        process.errorOccurred.connect(partial(self.onProcessError, Id))
+        process.stateChanged.connect(partial(self.onProcessStateChanged, Id))
 
-    def quit(self) -> None:
+    def onProcessFinished(self, Id: IdType, *args: Any) -> None:
         """
-        Stops the monitor.
+        Gets called when a process emits the finished signal. Emits processTerminated with the Id of the process.
+
+        :param Id: The Id of the process that has finished.
+        """
+        if self.processes.pop(Id, None) is not None:
+            self.processTerminated.emit(Id)
+
+    def onProcessError(self, Id: IdType, error: QtCore.QProcess.ProcessError) -> None:
         """
-        self.checking = False
+        Gets called when a process emits the errorOccurred signal. A process that failed to start never emits finished,
+        so it gets reported as terminated here. Other errors, like the Crashed error of a process that gets closed by
+        the manager, are followed by finished and only logged for debugging.
+
+        :param Id: The Id of the process.
+        :param error: The error that occurred.
+        """
+        metaObject = QtCore.QProcess.staticMetaObject
+        errorName = metaObject.enumerator(metaObject.indexOfEnumerator('ProcessError')).valueToKey(error)
+        if error == QtCore.QProcess.FailedToStart:
+            logger.warning(f'Process {Id} reported error {errorName}')
+            self.onProcessFinished(Id)
+        else:
+            logger.debug(f'Process {Id} reported error {errorName}')
 
-    def run(self) -> None:
+    def onProcessStateChanged(self, Id: IdType, state: QtCore.QProcess.ProcessState) -> None:
         """
-        Starts the monitor, periodically checks if all the processes are still running. Emits processTerminated with the
-        Id of the process that has finished.
+        Gets called when a process changes its state, and logs the new state.
+
+        :param Id: The Id of the process.
+        :param state: The new state of the process.
         """
-        while self.checking:
-            processesCopy = self.processes.copy()
-            for Id, p in processesCopy.items():
-                state = p.state()
-                if state == 0:
-                    del self.processes[Id]
-                    self.processTerminated.emit(Id)
-            qtsleep(0.01)
+        logger.debug(f'Process {Id} changed state to {state}')
+
+
+class LauncherPool(QtCore.QObject):
+    """
+    Keeps a number of idle python processes around that already have imported plottr and Qt, and only wait for the
+    arguments of the app they should run. Launching an app through one of them saves the startup time of the
+    interpreter and of the imports.
+
+    The idle processes run the apprunner in standby (see :data:`.STANDBY_FLAG`) and receive the command line arguments
+    of the app as a json list on their standard input.
+    """
+
+    def __init__(self, size: int = 1, parent: Optional[QtCore.QObject] = None):
+        """
+        Constructor of LauncherPool. Starts the idle processes right away.
+
+        :param size: The number of idle processes to keep around.
+        :param parent: The parent of the pool.
+        """
+        super().__init__(parent=parent)
+        self.size = size
+        self.idle: List[QtCore.QProcess] = []
+        self.fill()
+
+    def fill(self) -> None:
+        """
+        Starts idle processes until there are as many as the size of the pool. Does not wait for them to start.
+        """
+        while len(self.idle) < self.size:
+            process = QtCore.QProcess()
+            process.setProcessChannelMode(QtCore.QProcess.ForwardedChannels)
+            process.start(sys.executable, [APPRUNNER, STANDBY_FLAG])
+            self.idle.append(process)
+
+    def launch(self, arguments: List[str]) -> Optional[QtCore.QProcess]:
+        """
+        Launches an app in one of the idle processes and starts a new idle process in its place.
+
+        :param arguments: The command line arguments for the apprunner.
+        :returns: The process running the app, or None if no idle process could take the app. The caller should then
+            start the app in a new process.
+        """
+        while len(self.idle) > 0:
+            process = self.idle.pop(0)
+            # The process might still be starting, it can only take the arguments once it runs.
+            if process.waitForStarted(1000):
+                process.write((json.dumps(arguments) + '\n').encode())
+                if process.waitForBytesWritten(1000):
+                    process.closeWriteChannel()
+                    self.fill()
+                    return process
+            # The idle process died or did not take the arguments, discard it.
+            process.close()
+        self.fill()
+        return None
+
+    def close(self) -> None:
+        """
+        Kills all idle processes.
+        """
+        for process in self.idle:
+            process.close()
+        self.idle = []
+
+
+class IOWorker(QtCore.QObject):
+    """
+    Helper class that lives in a separate thread and owns the ``ROUTER`` socket the manager uses to talk to all apps.
+    The socket is bound to :attr:`endpoint`, every app connects a ``DEALER`` socket to it, with its port as routing
+    identity. Requests for an app are held back until the app has said hello (see :data:`._HELLO`).
+
+    Requests are handed over with :meth:`.enqueue` together with a ``concurrent.futures.Future``, which gets the reply
+    of the app as its result. Every request gets a new request id that travels in the envelope of the message (the
+    app sends the envelope back with its reply), so any number of requests can be in flight at the same time. The
+    socket is watched with a QSocketNotifier, the worker is idle unless a reply arrives.
+
+    The worker also owns the ``PULL`` socket the apps send their log records to (see :class:`.LogForwarder`), and
+    emits logRecordReceived for every record.
+    """
+
+    #: Signal(str, dict) -- emitted when a log record of an app arrives.
+    #: Arguments:
+    #:  * The port of the app.
+    #:  * The attributes of the log record.
+    logRecordReceived = Signal(str, object)
+
+    def __init__(self, context: zmq.Context, transport: str = DEFAULT_TRANSPORT, socketDirectory: Optional[str] = None,
+                 parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent=parent)
+        self.router: Optional[zmq.Socket] = _makeSocket(context, zmq.ROUTER, SOCKET_BUFFER_SIZE)
+        # Raise an error when messaging an app that is not connected, instead of silently dropping the message.
+        self.router.setsockopt(zmq.ROUTER_MANDATORY, 1)
+        # An app reusing the port of a closed app takes over its identity.
+        self.router.setsockopt(zmq.ROUTER_HANDOVER, 1)
+        self.endpoint = _bindLocal(self.router, 'manager', transport, socketDirectory)
+        self.notifier: Optional[QtCore.QSocketNotifier] = None
+
+        self.logSocket: Optional[zmq.Socket] = _makeSocket(context, zmq.PULL)
+        self.logEndpoint = _bindLocal(self.logSocket, 'log', transport, socketDirectory)
+        self.logNotifier: Optional[QtCore.QSocketNotifier] = None
+        self.requestIds = count()
+        # Requests waiting for their reply, by request id: (identity, future, shared memory blocks).
+        self.pending: Dict[bytes, Tuple[bytes, Future, List[shared_memory.SharedMemory]]] = {}
+        # Requests for apps that did not say hello yet, by identity: [(request id, frames)].
+        self.unsent: Dict[bytes, List[Tuple[bytes, List[Any]]]] = {}
 
     @Slot()
-    def onReadyStandardOutput(self) -> None:
+    def start(self) -> None:
         """
-        Gets called when any process emits the readyReadStandardOutput signal, and prints any message it receives.
+        Starts watching the socket. Has to be called from the thread of the worker.
         """
-        for Id, process in self.processes.items():
-            output = str(process.readAllStandardOutput(), 'utf-8')  # type: ignore[call-overload] # mypy complains about str() not accepting QbyteArray even though it is an object
-            if output != '':
-                print(f'Process {Id}: {output}')
+        assert isinstance(self.router, zmq.Socket)
+        self.notifier = _socketNotifier(self.router, self)
+        self.notifier.activated.connect(self.onActivated)
+        assert isinstance(self.logSocket, zmq.Socket)
+        self.logNotifier = _socketNotifier(self.logSocket, self)
+        self.logNotifier.activated.connect(self.onLogActivated)
+
+    @Slot(object)
+    def connectApp(self, identity: bytes) -> None:
+        """
+        Registers an app that is about to be launched. Requests to it are held back until it says hello.
+        """
+        self.unsent[identity] = []
+
+    @Slot(object)
+    def disconnectApp(self, identity: bytes) -> None:
+        """
+        Forgets a closed app. Requests to the app that did not get a reply fail.
+        """
+        self.unsent.pop(identity, None)
+        # Only collect the requests to fail instead of copying all pending requests.
+        closed = [requestId for requestId, (appIdentity, _, _) in self.pending.items() if appIdentity == identity]
+        for requestId in closed:
+            self.fail(requestId, RuntimeError(f'App {identity.decode()} closed before replying.'))
+
+    @Slot(object, object, object, object)
+    def enqueue(self, identity: bytes, frames: List[Any], sharedBlocks: List[shared_memory.SharedMemory],
+                future: Future) -> None:
+        """
+        Sends a serialized message to an app.
+
+        :param identity: The identity of the app.
+        :param frames: The frames of the message, see :func:`._serialize`.
+        :param sharedBlocks: Shared memory blocks used by the message, released when the reply arrives.
+        :param future: The future that gets the reply.
+        """
+        requestId = next(self.requestIds).to_bytes(8, 'big')
+        self.pending[requestId] = (identity, future, sharedBlocks)
+        if identity in self.unsent:
+            self.unsent[identity].append((requestId, frames))
+            return
+        self.send(identity, requestId, frames)
+        # Sending can consume the edge of the file descriptor, check for replies right away.
+        self.onActivated()
+
+    def send(self, identity: bytes, requestId: bytes, frames: List[Any]) -> None:
+        """
+        Sends a request to an app, the request fails if the app can't be reached. Never blocks: with ROUTER_MANDATORY
+        a send to an app whose queue is full would wait for it, instead it fails with ``zmq.Again``.
+        """
+        assert isinstance(self.router, zmq.Socket)
+        try:
+            self.router.send_multipart([identity, requestId, b''] + frames, flags=zmq.NOBLOCK, copy=False)
+        except zmq.ZMQError as e:
+            self.fail(requestId, e)
+
+    @Slot()
+    def onActivated(self) -> None:
+        """
+        Gets called when the file descriptor of the socket becomes readable, and resolves the futures of all replies
+        that have arrived.
+        """
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+        while self.router is not None and _hasMessage(self.router):
+            frames = self.router.recv_multipart(copy=False)
+            if len(frames) == 2 and frames[1].bytes == _HELLO:
+                for requestId, message in self.unsent.pop(frames[0].bytes, []):
+                    self.send(frames[0].bytes, requestId, message)
+                continue
+            # frames are [identity, request id, empty delimiter, message...]
+            entry = self.pending.pop(frames[1].bytes, None)
+            if entry is None:
+                continue
+            _, future, sharedBlocks = entry
+            self.release(sharedBlocks)
+            try:
+                future.set_result(_deserialize([f.buffer for f in frames[3:]]))
+            except Exception as e:
+                future.set_exception(e)
+        if self.notifier is not None:
+            self.notifier.setEnabled(True)
+
+    @Slot()
+    def onLogActivated(self) -> None:
+        """
+        Gets called when the file descriptor of the log socket becomes readable, and emits logRecordReceived for
+        all log records that have arrived.
+        """
+        if self.logNotifier is not None:
+            self.logNotifier.setEnabled(False)
+        while self.logSocket is not None and _hasMessage(self.logSocket):
+            frames = self.logSocket.recv_multipart(copy=False)
+            try:
+                info = _deserialize([f.buffer for f in frames[1:]])
+            except Exception:
+                logger.exception('Could not read a log record of an app.')
+                continue
+            self.logRecordReceived.emit(frames[0].bytes.decode(), info)
+        if self.logNotifier is not None:
+            self.logNotifier.setEnabled(True)
+
+    def fail(self, requestId: bytes, exception: BaseException) -> None:
+        """
+        Fails a pending request with the given exception.
+        """
+        entry = self.pending.pop(requestId, None)
+        if entry is not None:
+            _, future, sharedBlocks = entry
+            self.release(sharedBlocks)
+            future.set_exception(exception)
+
+    @staticmethod
+    def release(sharedBlocks: List[shared_memory.SharedMemory]) -> None:
+        """
+        Closes and unlinks the shared memory blocks of a message.
+        """
+        for shm in sharedBlocks:
+            shm.close()
+            shm.unlink()
 
     @Slot()
-    def onReadyStandardError(self) -> None:
+    def close(self) -> None:
         """
-        Gets called when any process emits the readyReadStandardError signal, and prints any messages it receives.
+        Fails all pending requests and closes the socket.
         """
-        for Id, process in self.processes.items():
-            output = str(process.readAllStandardError(), 'utf-8')  # type: ignore[call-overload] # mypy complains about str() not accepting QbyteArray even though it is an object.
-            if output != '':
-                print(f'Process {Id}: {output}')
+        while len(self.pending) > 0:
+            self.fail(next(iter(self.pending)), RuntimeError('The app manager has been closed.'))
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier.deleteLater()
+            self.notifier = None
+        if self.logNotifier is not None:
+            self.logNotifier.setEnabled(False)
+            self.logNotifier.deleteLater()
+            self.logNotifier = None
+        # The context is shared within the process, only close our own sockets.
+        if self.router is not None:
+            self.router.close()
+            self.router = None
+        if self.logSocket is not None:
+            self.logSocket.close()
+            self.logSocket = None
 
 
 class AppManager(QtWidgets.QWidget):
     """A widget that launches, manages, and communicates with app instances
     that run in separate processes.
 
-    Each app will get assigned a tcp port to use for communication purposes. The first port to be assigned is 12345 by
+    Each app will get assigned a port to use for communication purposes. The first port to be assigned is 12345 by
     default. Every app after the first one will use the next available integer. The manager will reuse a port if an app
-    gets closed and frees the port with it.
+    gets closed and frees the port with it. With the ``ipc`` transport the port only names the socket file the app
+    listens on, in a temporary directory of the manager, with ``tcp`` it is an actual port on the loopback interface.
+    :meth:`.appEndpoint` returns the endpoint of an app, for talking to it from outside the manager.
+
+    The manager talks to all apps through a single ``ROUTER`` socket, owned by an :class:`.IOWorker` in a separate
+    thread. Every app connects to it with its port as routing identity. Messages do not block the GUI:
+    :meth:`.message` returns a future, :meth:`.messageSync` waits for the reply.
     """
 
     #: Signal(IdType, QtCore.QProcess) -- emitted when a new app is created.
@@ -309,29 +982,72 @@ class AppManager(QtWidgets.QWidget):
     #:  * The QProcess running that app.
     newProcess = Signal(object, object)
 
-    closeProcmon = Signal()
+    #: Signal(object) -- emitted to register an app with the IOWorker before it gets launched.
+    #: Arguments:
+    #:  * The identity of the app.
+    appConnected = Signal(object)
 
-    def __init__(self, initialPort: int = 12345, parent: Optional[QtWidgets.QWidget] = None):
+    #: Signal(object) -- emitted to tell the IOWorker that an app has closed.
+    #: Arguments:
+    #:  * The identity of the app.
+    appDisconnected = Signal(object)
+
+    #: Signal(object, object, object, object) -- emitted to hand a message over to the IOWorker.
+    #: Arguments:
+    #:  * The identity of the app.
+    #:  * The frames of the message.
+    #:  * The shared memory blocks used by the message.
+    #:  * The future that gets the reply.
+    requestQueued = Signal(object, object, object, object)
+
+    def __init__(self, initialPort: int = 12345, parent: Optional[QtWidgets.QWidget] = None,
+                 transport: str = DEFAULT_TRANSPORT, launcherPoolSize: int = 1, ioThreads: Optional[int] = None):
         """
         Constructor of AppManager.
 
         :param initialPort: The first port to be assigned to the first App.
+        :param transport: The zmq transport used to communicate with the apps, either ``ipc`` or ``tcp``.
+        :param launcherPoolSize: The number of idle processes kept ready for launching apps (see
+            :class:`.LauncherPool`). ``0`` starts a new interpreter for every app.
+        :param ioThreads: If not None, the number of zmq I/O threads, see :func:`.configure_io_threads`. Only has an
+            effect if no socket has been created in this process yet.
         """
         super().__init__(parent=parent)
-        self.processes: Dict[IdType, Dict[str, Union[QtCore.QProcess, zmq.sugar.socket.Socket, int]]] = {}
-
-        self.context = zmq.Context()
-        self.poller = zmq.Poller()
-        self.address = '127.0.0.1'
-        self.initialPort = initialPort  # This is the port that will be automatically assigned to the next app
-
-        self.procmon: Optional[ProcessMonitor] = ProcessMonitor()
-        self.procmonThread: Optional[QtCore.QThread] = QtCore.QThread(parent=self)
-        self.procmon.moveToThread(self.procmonThread)
+        self.processes: Dict[IdType, Dict[str, Union[QtCore.QProcess, bytes, int]]] = {}
+
+        if ioThreads is not None:
+            configure_io_threads(ioThreads)
+        self.context: zmq.Context = zmq.Context.instance()
+        self.transport = transport
+        # The ipc socket files of our apps live in a directory of their own, so other managers can't take them over.
+        self.socketDirectory: Optional[str] = None
+        if transport == 'ipc':
+            self.socketDirectory = tempfile.mkdtemp(prefix='plottr-')
+
+        self.initialPort = initialPort  # This is the port that will be automatically assigned to the first app
+        # Ports of closed apps, as a heap, and the next port that has never been assigned.
+        self.freePorts: List[int] = []
+        self.nextPort = initialPort
+
+        self.procmon: Optional[ProcessMonitor] = ProcessMonitor(parent=self)
         self.newProcess.connect(self.procmon.onNewProcess)
         self.procmon.processTerminated.connect(self.onProcessEneded)
-        self.procmonThread.started.connect(self.procmon.run)
-        self.procmonThread.start()
+
+        self.ioWorker: Optional[IOWorker] = IOWorker(self.context, self.transport, self.socketDirectory)
+        self.managerEndpoint = self.ioWorker.endpoint
+        self.logEndpoint = self.ioWorker.logEndpoint
+        self.ioWorker.logRecordReceived.connect(self.onLogRecord)
+        self.ioThread: Optional[QtCore.QThread] = QtCore.QThread(parent=self)
+        self.ioWorker.moveToThread(self.ioThread)
+        self.appConnected.connect(self.ioWorker.connectApp)
+        self.appDisconnected.connect(self.ioWorker.disconnectApp)
+        self.requestQueued.connect(self.ioWorker.enqueue)
+        self.ioThread.started.connect(self.ioWorker.start)
+        self.ioThread.start()
+
+        self.launcherPool: Optional[LauncherPool] = None
+        if launcherPoolSize > 0:
+            self.launcherPool = LauncherPool(launcherPoolSize, parent=self)
 
     def launchApp(self, Id: IdType, module: str, func: str, *args: Any) -> bool:
         """
@@ -345,22 +1061,36 @@ class AppManager(QtWidgets.QWidget):
         :returns: True if the process has launched successfully, False if not.
         """
         if Id not in self.processes:
-            # Find the first available port
-            usedPorts = [data['port'] for data in self.processes.values()]
-            port = self.initialPort
-            while port in usedPorts:
-                port += 1
-
-            fullArgs = [str(Path(plottrPath).joinpath('apps', 'apprunner.py')), str(port), module, func] + list(args)
-            process = QtCore.QProcess()
-            process.start(sys.executable, fullArgs)
-            process.waitForStarted(100)
-            socket = self.context.socket(zmq.REQ)
-            socket.connect(f'tcp://{self.address}:{str(port)}')
-            self.poller.register(socket, zmq.POLLIN)
+            # Reuse the lowest port freed by a closed app, if there is none take a new one.
+            if len(self.freePorts) > 0:
+                port = heapq.heappop(self.freePorts)
+            else:
+                port = self.nextPort
+                self.nextPort += 1
+
+            appArgs = ['--transport', self.transport, '--manager-endpoint', self.managerEndpoint,
+                       '--log-endpoint', self.logEndpoint]
+            if self.socketDirectory is not None:
+                appArgs += ['--socket-directory', self.socketDirectory]
+            appArgs += [str(port), module, func] + list(args)
+            identity = str(port).encode()
+            # The app can say hello as soon as it runs, the IOWorker has to know about it before that.
+            self.appConnected.emit(identity)
+            process = None
+            if self.launcherPool is not None:
+                process = self.launcherPool.launch(appArgs)
+            if process is None:
+                process = QtCore.QProcess()
+                process.setProcessChannelMode(QtCore.QProcess.ForwardedChannels)
+                process.start(sys.executable, [APPRUNNER] + appArgs)
+                if not process.waitForStarted(1000):
+                    logger.warning(f'Process for app {Id} failed to start: {process.errorString()}')
+                    self.appDisconnected.emit(identity)
+                    heapq.heappush(self.freePorts, port)
+                    return False
             self.processes[Id] = {'process': process,
                                   'port': port,
-                                  'socket': socket}
+                                  'identity': identity}
             self.newProcess.emit(Id, process)
             return True
 
@@ -375,28 +1105,100 @@ class AppManager(QtWidgets.QWidget):
 
         :param Id: The id of the parameter to delete.
         """
-        del self.processes[Id]
+        data = self.processes.pop(Id, None)
+        if data is not None:
+            assert isinstance(data['port'], int)
+            heapq.heappush(self.freePorts, data['port'])
+            assert isinstance(data['identity'], bytes)
+            self.appDisconnected.emit(data['identity'])
+
+    @Slot(str, object)
+    def onLogRecord(self, port: str, info: Dict[str, Any]) -> None:
+        """
+        Gets triggered when a log record of an app arrives. Passes the record on to the logger of the same name in
+        this process, with the Id of the app in front of the message.
 
-    def pingApp(self, Id: IdType) -> bool:
+        :param port: The port of the app that sent the record.
+        :param info: The attributes of the log record.
+        """
+        record = logging.makeLogRecord(info)
+        appLogger = logging.getLogger(record.name)
+        if not appLogger.isEnabledFor(record.levelno):
+            return
+        Id: Union[IdType, str] = port
+        for processId, data in self.processes.items():
+            if str(data['port']) == port:
+                Id = processId
+                break
+        record.msg = f'Process {Id}: {record.msg}'
+        appLogger.handle(record)
+
+    def appEndpoint(self, Id: IdType) -> str:
+        """
+        Returns the zmq endpoint of an app. Any ``REQ`` socket can connect to it and talk to the app, see
+        :meth:`.App.onMessageReceived` for the messages the app understands.
+
+        :param Id: The Id of the app.
+        :returns: The endpoint string.
+        """
+        if Id not in self.processes:
+            raise ValueError(f"no app with ID <{Id}> running.")
+        port = self.processes[Id]['port']
+        assert isinstance(port, int)
+        return _endpoint(port, self.transport, self.socketDirectory)
+
+    def _request(self, Id: IdType, obj: Any, useSharedMemory: bool = False) -> Future:
+        """
+        Hands an object over to the IOWorker to be sent to an app.
+
+        :param Id: The Id of the app.
+        :param obj: The object to send.
+        :param useSharedMemory: If True, large numpy arrays in the object are passed through shared memory, which
+            gets released once the reply arrives.
+        :returns: A future that gets the reply of the app.
+        """
+        future: Future = Future()
+        if self.ioWorker is None:
+            future.set_exception(RuntimeError('The app manager has been closed.'))
+            return future
+        if Id not in self.processes:
+            future.set_exception(ValueError(f"no app with ID <{Id}> running."))
+            return future
+        sharedBlocks: List[shared_memory.SharedMemory] = []
+        try:
+            frames = _serialize(obj, sharedBlocks if useSharedMemory else None)
+        except Exception as e:
+            IOWorker.release(sharedBlocks)
+            future.set_exception(e)
+            return future
+        # The out-of-band buffers are views of the arrays of the caller, who may change them before the IOWorker has
+        # sent the message.
+        frames = [f if isinstance(f, bytes) else bytes(f) for f in frames]
+        self.requestQueued.emit(self.processes[Id]['identity'], frames, sharedBlocks, future)
+        return future
+
+    def pingApp(self, Id: IdType, timeout: Optional[float] = REPLY_TIMEOUT) -> bool:
         """
         Pings the specified app. If a response is received returns true, False otherwise.
 
         :param Id: The Id of the app to be pinged.
+        :param timeout: Seconds to wait for the response. Waits forever if None.
         :return: True if the ping was successful, False if not.
         """
         if Id not in self.processes:
             logger.warning(f'{Id} not present in the processes.')
             return False
-        socket = self.processes[Id]['socket']
-        assert isinstance(socket, zmq.sugar.socket.Socket)
-        socket.send_pyobj('ping')
-        reply = socket.recv_pyobj()
+        try:
+            reply = self._request(Id, 'ping').result(timeout)
+        except (FutureTimeoutError, zmq.ZMQError, RuntimeError) as e:
+            logger.warning(f'Ping of app {Id} failed: {e!r}')
+            return False
         if reply == 'pong':
             return True
         return False
 
-    def message(self, Id: IdType, targetName: str, targetProperty: str, value: Any) -> Any:
-        """Send a message to an app instance.
+    def message(self, Id: IdType, targetName: str, targetProperty: str, value: Any) -> Future:
+        """Send a message to an app instance. Does not wait for the reply.
 
         :param Id: ID of the app instance.
 
@@ -420,8 +1222,10 @@ class AppManager(QtWidgets.QWidget):
             values. Commonly ``{'dataIn': someData}`` for most flowcharts.
             For the ``setInput`` option of the flowchart, this may be any object
             and will be ignored.
+            Large numpy arrays in the value (see :data:`.SHARED_MEMORY_THRESHOLD`) are passed to the app through
+            shared memory. The value is copied before the call returns, so it can be changed right away.
 
-        :returns: the response to the message. Can be:
+        :returns: A ``concurrent.futures.Future`` that gets the response to the message as result. Can be:
 
             *  An exception if the message resulted in an exception being raised.
 
@@ -433,42 +1237,63 @@ class AppManager(QtWidgets.QWidget):
         """
         if Id not in self.processes:
             raise ValueError(f"no app with ID <{Id}> running.")
-        else:
-            socket = self.processes[Id]['socket']
-            assert isinstance(socket, zmq.sugar.socket.Socket)
-            socket.send_pyobj((targetName, targetProperty, value))
-            response = socket.recv_pyobj()
 
+        future = self._request(Id, (targetName, targetProperty, value), useSharedMemory=True)
+        future.add_done_callback(partial(self._logException, Id))
+        return future
+
+    def messageSync(self, Id: IdType, targetName: str, targetProperty: str, value: Any,
+                    timeout: Optional[float] = REPLY_TIMEOUT) -> Any:
+        """Send a message to an app instance and wait for the response. See :meth:`.message` for the arguments.
+
+        :param timeout: Seconds to wait for the response. Waits forever if None.
+        :returns: The response to the message.
+        :raises concurrent.futures.TimeoutError: If the response does not arrive in time.
+        """
+        return self.message(Id, targetName, targetProperty, value).result(timeout)
+
+    @staticmethod
+    def _logException(Id: IdType, future: Future) -> None:
+        """
+        Logs the exception an app replied with.
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        response = future.result()
         if isinstance(response, Exception):
             logger.warning(f'Exception occurred in app <{Id}>:')
             print_exception(type(response), response, response.__traceback__)
 
-        return response
-
     def closeEvent(self, a0: QtGui.QCloseEvent) -> None:
         """
         Overwrite of the closeEvent. Makes sure everything closes up properly.
         """
+        if self.launcherPool is not None:
+            self.launcherPool.close()
+            self.launcherPool = None
+
         if self.procmon is not None:
-            self.procmon.quit()
+            self.procmon.processTerminated.disconnect(self.onProcessEneded)
             self.procmon.deleteLater()
             self.procmon = None
 
-        if self.procmonThread is not None:
-            self.procmonThread.quit()
-            self.procmonThread.wait()
-            self.procmonThread.deleteLater()
-            self.procmonThread = None
-
-        for Id, data in self.processes.items():
+        if self.ioWorker is not None and self.ioThread is not None:
+            QtCore.QMetaObject.invokeMethod(self.ioWorker, 'close', QtCore.Qt.BlockingQueuedConnection)
+            self.ioThread.quit()
+            self.ioThread.wait()
+            self.ioWorker.deleteLater()
+            self.ioThread.deleteLater()
+            self.ioWorker = None
+            self.ioThread = None
+
+        # Closing a process can trigger the removal of its entry, so iterate over a snapshot.
+        for Id, data in list(self.processes.items()):
             process = data['process']
             assert isinstance(process, QtCore.QProcess)
             process.close()
 
-            socket = data['socket']
-            assert isinstance(socket, zmq.sugar.socket.Socket)
-            socket.close(1)
-
-        self.context.destroy(1)
+        if self.socketDirectory is not None:
+            shutil.rmtree(self.socketDirectory, ignore_errors=True)
+            self.socketDirectory = None
 
         return super().closeEvent(a0)
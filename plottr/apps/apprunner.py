@@ -1,34 +1,56 @@
 """
 Script through which new Apps are opened by the :class:plottr.apps.appmanager.AppManager.
 All the arguments in the script are the arguments for :class:plottr.apps.appmanager.App
+
+If the only argument is :data:plottr.apps.appmanager.STANDBY_FLAG, the script imports everything it needs and then
+waits for the arguments as a json list on its standard input. This is used by
+:class:plottr.apps.appmanager.LauncherPool.
 """
 
 import sys
+import json
 import importlib
 import argparse
 
 from plottr import qtapp
-from plottr.apps.appmanager import App
+from plottr.apps.appmanager import App, DEFAULT_TRANSPORT, STANDBY_FLAG
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description="Script to open apps"
     )
+    parser.add_argument('--transport', choices=['ipc', 'tcp'], default=DEFAULT_TRANSPORT,
+                        help='The zmq transport this process should listen on')
+    parser.add_argument('--socket-directory', default=None,
+                        help='The directory of the ipc socket file this process should listen on')
+    parser.add_argument('--manager-endpoint', default=None,
+                        help='The zmq endpoint of the app manager that launched this process')
+    parser.add_argument('--log-endpoint', default=None,
+                        help='The zmq endpoint the log records of the app get sent to')
     parser.add_argument('port', help='The port this process should communicate through', default="12345")
     parser.add_argument('module', default="plottr.apps.autoplot")
     parser.add_argument('function', default='autoplotDDH5App')
     parser.add_argument('app_arguments', nargs='*', default=["/home/msmt/Documents/code_playground/Slider playground/data/manual_data/simple_data.ddh5", 'data'])
 
-    args = parser.parse_args()
+    application = qtapp()
+
+    if sys.argv[1:] == [STANDBY_FLAG]:
+        line = sys.stdin.readline()
+        # An empty line means the manager closed our standard input without launching anything.
+        if line == '':
+            sys.exit(0)
+        args = parser.parse_args(json.loads(line))
+    else:
+        args = parser.parse_args()
     port = int(args.port)
     full_module = args.module
     func_name = args.function
     extra_arguments = tuple(args.app_arguments)
 
-    application = qtapp()
     module = importlib.import_module(full_module)
     func = getattr(module, func_name)
-    app = App(func, port, None, extra_arguments)
+    app = App(func, port, None, extra_arguments, transport=args.transport, logEndpoint=args.log_endpoint,
+              socketDirectory=args.socket_directory, managerEndpoint=args.manager_endpoint)
     sys.exit(application.exec_())
 
@@ -1,6 +1,8 @@
 """
 Script made to test the app manager
 """
+import sys
+import logging
 import numpy as np
 import psutil
 import zmq
@@ -8,7 +10,7 @@ import zmq
 from plottr.data.datadict import DataDictBase, DataDict
 from plottr.data.datadict_storage import datadict_to_hdf5
 from plottr import QtWidgets, QtCore, plottrPath
-from plottr.apps.appmanager import AppManager
+from plottr.apps.appmanager import AppManager, LogForwarder, ProcessMonitor, _send, _recv, _serialize, _deserialize
 from plottr import qtapp, qtsleep
 
 # Module where the launching function lives.
@@ -166,6 +168,8 @@ def test_correct_port_assignment(qtbot, tmp_path):
     appManager.launchApp(5, MODULE, FUNC, str(tmp_path), 'data')
     ports = [process['port'] for process in appManager.processes.values()]
     assert sorted(correctPorts) == sorted(ports)
+    # The new app takes over the identity of the closed app on the same port.
+    assert appManager.pingApp(5)
 
     ret = appManager.close()
     assert ret
@@ -202,10 +206,10 @@ def test_pinging_app_from_outside_manager(qtbot, tmp_path):
 
     context = zmq.Context()
     socket = context.socket(zmq.REQ)
-    socket.connect(f'tcp://127.0.0.1:12345')
+    socket.connect(appManager.appEndpoint(0))
 
-    socket.send_pyobj("ping")
-    reply = socket.recv_pyobj()
+    _send(socket, "ping")
+    reply = _recv(socket)
     assert reply == 'pong'
 
     ret = appManager.close()
@@ -225,10 +229,10 @@ def test_getting_values(qtbot, tmp_path):
 
     context = zmq.Context()
     socket = context.socket(zmq.REQ)
-    socket.connect(f'tcp://127.0.0.1:12345')
+    socket.connect(appManager.appEndpoint(0))
 
-    socket.send_pyobj(tuple(["fc", 'getOutput', None]))
-    reply = socket.recv_pyobj()
+    _send(socket, tuple(["fc", 'getOutput', None]))
+    reply = _recv(socket)
 
 
     ret = appManager.close()
@@ -237,6 +241,178 @@ def test_getting_values(qtbot, tmp_path):
     assert reply is not None
 
 
+def test_managers_do_not_share_endpoints(qtbot, tmp_path):
+    datadict = _make_testdata()
+    datadict_to_hdf5(datadict, str(tmp_path), 'data')
+
+    appManagers = [AppManager(), AppManager()]
+    for appManager in appManagers:
+        qtbot.addWidget(appManager)
+        assert appManager.launchApp(0, MODULE, FUNC, str(tmp_path), 'data')
+
+    assert appManagers[0].appEndpoint(0) != appManagers[1].appEndpoint(0)
+
+    for appManager in appManagers:
+        ret = appManager.close()
+        assert ret
+
+
+def test_tcp_transport(qtbot, tmp_path):
+    datadict = _make_testdata()
+    datadict_to_hdf5(datadict, str(tmp_path), 'data')
+
+    appManager = AppManager(transport='tcp')
+    appManager.show()
+    qtbot.waitExposed(appManager)
+    qtbot.addWidget(appManager)
+
+    assert appManager.launchApp(0, MODULE, FUNC, str(tmp_path), 'data')
+
+    context = zmq.Context()
+    socket = context.socket(zmq.REQ)
+    socket.connect(f'tcp://127.0.0.1:12345')
+
+    _send(socket, "ping")
+    reply = _recv(socket)
+    assert reply == 'pong'
+
+    ret = appManager.close()
+    assert ret
+
+
+def test_send_recv_arrays():
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    sender.bind('inproc://test-send-recv')
+    receiver = context.socket(zmq.PAIR)
+    receiver.connect('inproc://test-send-recv')
+
+    datadict = _make_testdata()
+    _send(sender, ('fc', 'setInput', {'dataIn': datadict}))
+    targetName, targetProperty, value = _recv(receiver)
+
+    assert targetName == 'fc'
+    assert targetProperty == 'setInput'
+    assert value['dataIn'] == datadict
+    assert value['dataIn'].data_vals('vals').flags.writeable
+
+    sender.close()
+    receiver.close()
+    context.term()
+
+
+def test_shared_memory_serialization():
+    datadict = _make_testdata()
+    sharedBlocks = []
+    frames = _serialize(('fc', 'setInput', {'dataIn': datadict}), sharedBlocks)
+    assert len(sharedBlocks) == 4
+
+    targetName, targetProperty, value = _deserialize(frames)
+    # the receiver keeps the memory mapped after the sender released the blocks.
+    for shm in sharedBlocks:
+        shm.close()
+        shm.unlink()
+
+    assert value['dataIn'] == datadict
+    vals = value['dataIn'].data_vals('vals')
+    assert vals.flags.writeable
+    vals[0, 0, 0] = 42
+    assert vals[0, 0, 0] == 42
+
+
+def test_send_recv_control_messages():
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    sender.bind('inproc://test-control-messages')
+    receiver = context.socket(zmq.PAIR)
+    receiver.connect('inproc://test-control-messages')
+
+    messages = ['ping', ('node', 'property', 1.5), ('node', 'property', [1, 2]),
+                ('node', 'property', {'a': (1, None)}), ('node', 'property', 2**70), ValueError('error')]
+    for message in messages:
+        _send(sender, message)
+        reply = _recv(receiver)
+        assert type(reply) == type(message)
+        assert repr(reply) == repr(message)
+
+    sender.close()
+    receiver.close()
+    context.term()
+
 
+def test_launch_without_launcher_pool(qtbot, tmp_path):
+    datadict = _make_testdata()
+    datadict_to_hdf5(datadict, str(tmp_path), 'data')
 
+    appManager = AppManager(launcherPoolSize=0)
+    appManager.show()
+    qtbot.waitExposed(appManager)
+    qtbot.addWidget(appManager)
+
+    assert appManager.launcherPool is None
+    assert appManager.launchApp(0, MODULE, FUNC, str(tmp_path), 'data')
+    assert appManager.pingApp(0)
 
+    ret = appManager.close()
+    assert ret
+
+
+def test_message_future(qtbot, tmp_path):
+    datadict = _make_testdata()
+    datadict_to_hdf5(datadict, str(tmp_path), 'data')
+
+    appManager = AppManager()
+    appManager.show()
+    qtbot.waitExposed(appManager)
+    qtbot.addWidget(appManager)
+
+    assert appManager.launchApp(0, MODULE, FUNC, str(tmp_path), 'data')
+
+    future = appManager.message(0, 'fc', 'getOutput', None)
+    qtbot.waitUntil(future.done, timeout=20000)
+    assert future.result() is not None
+
+    reply = appManager.messageSync(0, 'not a node', 'property', 1, timeout=20)
+    assert isinstance(reply, KeyError)
+
+    ret = appManager.close()
+    assert ret
+
+
+def test_process_monitor_errors(qtbot, caplog):
+    procmon = ProcessMonitor()
+
+    process = QtCore.QProcess()
+    procmon.onNewProcess(0, process)
+    with qtbot.waitSignal(procmon.processTerminated, timeout=5000) as blocker:
+        process.start('plottr-no-such-program', [])
+    assert blocker.args == [0]
+    assert 'Process 0 reported error FailedToStart' in caplog.text
+
+    caplog.clear()
+    process = QtCore.QProcess()
+    procmon.onNewProcess(1, process)
+    process.start(sys.executable, ['-c', 'import time; time.sleep(10)'])
+    assert process.waitForStarted(5000)
+    with qtbot.waitSignal(procmon.processTerminated, timeout=5000):
+        process.close()
+    # Closing a process makes it report Crashed, which is not worth a warning.
+    assert all(record.levelno < logging.WARNING for record in caplog.records)
+
+
+def test_log_forwarding(qtbot, caplog):
+    appManager = AppManager(launcherPoolSize=0)
+    qtbot.addWidget(appManager)
+
+    forwarder = LogForwarder(appManager.logEndpoint, '12345')
+    # Sent right after connecting, the manager must not miss it.
+    record = logging.makeLogRecord({'name': 'plottr.test', 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                                    'msg': 'message from an app'})
+    forwarder.emit(record)
+
+    with caplog.at_level(logging.WARNING):
+        qtbot.waitUntil(lambda: 'Process 12345: message from an app' in caplog.text, timeout=5000)
+
+    forwarder.close()
+    ret = appManager.close()
+    assert ret